@@ -1,22 +1,55 @@
 #!/usr/bin/env python3
 import os
+import sys
+from operator import itemgetter
 
 import aws_cdk as cdk
 
 from stack import HlsLpdaacReconciliationStack
 
-stack_name = os.environ["HLS_LPDAAC_STACK"]
-inventory_reports_bucket = os.environ["HLS_LPDAAC_INVENTORY_REPORTS_BUCKET"]
-reconciliation_reports_bucket = os.environ["HLS_LPDAAC_RECONCILIATION_REPORTS_BUCKET"]
-forward_bucket = os.environ["HLS_LPDAAC_FORWARD_BUCKET"]
-historical_bucket = os.environ["HLS_LPDAAC_HISTORICAL_BUCKET"]
-request_topic_arn = os.environ["HLS_LPDAAC_REQUEST_TOPIC_ARN"]
-response_topic_arn = os.environ["HLS_LPDAAC_RESPONSE_TOPIC_ARN"]
-notification_email_address = os.environ["HLS_LPDAAC_NOTIFICATION_EMAIL_ADDRESS"]
-managed_policy_name = os.getenv("HLS_LPDAAC_MANAGED_POLICY_NAME", "mcp-tenantOperator")
+TAGS = (
+    ("Project", "hls"),
+    ("App", "HLS-LPDAAC-Reconciliation"),
+)
+
+REQUIRED_ENV_VARS = (
+    "HLS_LPDAAC_STACK",
+    "HLS_LPDAAC_INVENTORY_REPORTS_BUCKET",
+    "HLS_LPDAAC_RECONCILIATION_REPORTS_BUCKET",
+    "HLS_LPDAAC_FORWARD_BUCKET",
+    "HLS_LPDAAC_HISTORICAL_BUCKET",
+    "HLS_LPDAAC_REQUEST_TOPIC_ARN",
+    "HLS_LPDAAC_RESPONSE_TOPIC_ARN",
+    "HLS_LPDAAC_NOTIFICATION_EMAIL_ADDRESS",
+)
+
+# Snapshot the environment once, rather than decoding each value on every access.
+env = dict(os.environ)
+
+if missing := [name for name in REQUIRED_ENV_VARS if name not in env]:
+    sys.exit(f"ERROR: Missing required environment variables: {', '.join(missing)}")
+
+(
+    stack_name,
+    inventory_reports_bucket,
+    reconciliation_reports_bucket,
+    forward_bucket,
+    historical_bucket,
+    request_topic_arn,
+    response_topic_arn,
+    notification_email_address,
+) = itemgetter(*REQUIRED_ENV_VARS)(env)
+
+managed_policy_name = env.get("HLS_LPDAAC_MANAGED_POLICY_NAME", "mcp-tenantOperator")
+
+# Skip capturing a stack trace for every construct (and its metadata) during synth.
+app = cdk.App(
+    stack_traces=False,
+    context={"aws:cdk:disable-creation-stack-traces": True},
+)
 
 HlsLpdaacReconciliationStack(
-    app := cdk.App(),
+    app,
     f"{stack_name}-lpdaac-reconciliation",
     hls_inventory_reports_bucket=inventory_reports_bucket,
     hls_forward_bucket=forward_bucket,
@@ -26,12 +59,12 @@ HlsLpdaacReconciliationStack(
     lpdaac_reconciliation_reports_bucket=reconciliation_reports_bucket,
     notification_email_address=notification_email_address,
     managed_policy_name=managed_policy_name,
+    synthesizer=cdk.DefaultStackSynthesizer(generate_bootstrap_version_rule=False),
 )
 
-for k, v in dict(
-    Project="hls",
-    App="HLS-LPDAAC-Reconciliation",
-).items():
-    cdk.Tags.of(app).add(k, v, apply_to_launched_instances=True)
+tags = cdk.Tags.of(app)
+
+for k, v in TAGS:
+    tags.add(k, v, apply_to_launched_instances=True)
 
 app.synth()
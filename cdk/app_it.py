@@ -1,37 +1,80 @@
 #!/usr/bin/env python3
 import os
+import sys
+from operator import itemgetter
 
 import aws_cdk as cdk
 from stack import HlsLpdaacReconciliationStack
 from stack_it import HlsLpdaacReconciliationStackIT
 
-stack_name = os.environ["HLS_LPDAAC_STACK"]
-notification_email_address = os.environ["HLS_LPDAAC_NOTIFICATION_EMAIL_ADDRESS"]
-managed_policy_name = os.getenv("HLS_LPDAAC_MANAGED_POLICY_NAME", "mcp-tenantOperator")
+TAGS = (
+    ("Project", "hls"),
+    ("App", "HLS-LPDAAC-Reconciliation"),
+)
+
+REQUIRED_ENV_VARS = (
+    "HLS_LPDAAC_STACK",
+    "HLS_LPDAAC_NOTIFICATION_EMAIL_ADDRESS",
+)
+
+VALID_TARGETS = {"all", "app", "resources"}
+
+env = dict(os.environ)
+
+if missing := [name for name in REQUIRED_ENV_VARS if name not in env]:
+    sys.exit(f"ERROR: Missing required environment variables: {', '.join(missing)}")
+
+stack_name, notification_email_address = itemgetter(*REQUIRED_ENV_VARS)(env)
+managed_policy_name = env.get("HLS_LPDAAC_MANAGED_POLICY_NAME", "mcp-tenantOperator")
+targets = {t.strip() for t in (env.get("HLS_LPDAAC_TARGETS") or "all").split(",")}
+
+if invalid := sorted(targets - VALID_TARGETS):
+    sys.exit(
+        f"ERROR: Invalid HLS_LPDAAC_TARGETS: {', '.join(invalid)}"
+        f" (expected any of: {', '.join(sorted(VALID_TARGETS))})"
+    )
+
+app = cdk.App(
+    stack_traces=False,
+    context={"aws:cdk:disable-creation-stack-traces": True},
+)
 
 stack_it = HlsLpdaacReconciliationStackIT(
-    app := cdk.App(),
+    app,
     f"{stack_name}-lpdaac-reconciliation-it-resources",
     managed_policy_name=managed_policy_name,
 )
 
-HlsLpdaacReconciliationStack(
-    app,
-    f"{stack_name}-lpdaac-reconciliation-it",
+# Attributes of the resources stack used by the app stack under test
+resources = dict(
     hls_inventory_reports_bucket=stack_it.hls_inventory_reports_bucket.bucket_name,
     hls_forward_bucket=stack_it.hls_forward_bucket.bucket_name,
     hls_historical_bucket=stack_it.hls_historical_bucket.bucket_name,
     lpdaac_request_topic_arn=stack_it.lpdaac_request_topic.topic_arn,
     lpdaac_response_topic_arn=stack_it.lpdaac_response_topic.topic_arn,
     lpdaac_reconciliation_reports_bucket=stack_it.lpdaac_reports_bucket.bucket_name,
-    notification_email_address=notification_email_address,
-    managed_policy_name=managed_policy_name,
 )
 
-for k, v in dict(
-    Project="hls",
-    App="HLS-LPDAAC-Reconciliation",
-).items():
-    cdk.Tags.of(app).add(k, v, apply_to_launched_instances=True)
+# The app stack under test depends upon the resources stack, so the resources stack
+# is always included, but the app stack is included only when targeted.
+if targets & {"all", "app"}:
+    HlsLpdaacReconciliationStack(
+        app,
+        f"{stack_name}-lpdaac-reconciliation-it",
+        notification_email_address=notification_email_address,
+        managed_policy_name=managed_policy_name,
+        **resources,
+    )
+else:
+    # A deployed app stack imports these values from the resources stack, so keep
+    # exporting them, otherwise CloudFormation would refuse to update the resources
+    # stack, since it cannot delete an export that is in use.
+    for value in resources.values():
+        stack_it.export_value(value)
+
+tags = cdk.Tags.of(app)
+
+for k, v in TAGS:
+    tags.add(k, v, apply_to_launched_instances=True)
 
 app.synth()
@@ -1,5 +1,3 @@
-from typing import Optional
-
 from aws_cdk import Duration, Stack
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as lambda_
@@ -24,22 +22,35 @@ class HlsLpdaacReconciliationStack(Stack):
         lpdaac_response_topic_arn: str,
         lpdaac_reconciliation_reports_bucket: str,
         notification_email_address: str,
-        managed_policy_name: Optional[str] = None,
+        managed_policy_name: str | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
         if managed_policy_name:
-            account_id = iam.AccountRootPrincipal().account_id
-
             iam.PermissionsBoundary.of(self).apply(
                 iam.ManagedPolicy.from_managed_policy_arn(
                     self,
                     "PermissionsBoundary",
-                    f"arn:aws:iam::{account_id}:policy/{managed_policy_name}",
+                    self.format_arn(
+                        service="iam",
+                        region="",
+                        resource="policy",
+                        resource_name=managed_policy_name,
+                    ),
                 )
             )
 
+        # Lambda sizing may be overridden via CDK context, without code changes (e.g.,
+        # `cdk deploy -c response_memory=256 -c timeout_min=10`).
+        response_memory_size = int(self.node.try_get_context("response_memory") or 128)
+        timeout = Duration.minutes(int(self.node.try_get_context("timeout_min") or 15))
+
+        # Both handlers are packaged from the same source tree, so stage it only once.
+        code = lambda_.Code.from_asset(
+            "src", exclude=["**/*.egg-info", "**/__pycache__", "**/*.py[cod]"]
+        )
+
         # ----------------------------------------------------------------------
         # Request reconciliation report
         # ----------------------------------------------------------------------
@@ -50,18 +61,18 @@ class HlsLpdaacReconciliationStack(Stack):
         )
         # LPDAAC topic to send notifications of new inventory reports.
         lpdaac_request_topic = sns.Topic.from_topic_arn(
-            self, "LpdaacRequestTopic", topic_arn=lpdaac_request_topic_arn
+            self, "LpdaacRequestTopic", lpdaac_request_topic_arn
         )
         # Lambda function that publishes message to LPDAAC topic when a new inventory
         # report is created in the inventory reports bucket.
         lpdaac_request_lambda = lambda_.Function(
             self,
             "ReconciliationRequestHandler",
-            code=lambda_.Code.from_asset("src", exclude=["**/*.egg-info"]),
+            code=code,
             handler="hls_lpdaac_reconciliation/request/index.handler",
             runtime=lambda_.Runtime.PYTHON_3_12,
             memory_size=128,
-            timeout=Duration.minutes(15),
+            timeout=timeout,
             environment={
                 "LPDAAC_REQUEST_TOPIC_ARN": lpdaac_request_topic_arn,
             },
@@ -83,11 +94,11 @@ class HlsLpdaacReconciliationStack(Stack):
         lpdaac_response_lambda = lambda_.Function(
             self,
             "ReconciliationResponseHandler",
-            code=lambda_.Code.from_asset("src", exclude=["**/*.egg-info"]),
+            code=code,
             handler="hls_lpdaac_reconciliation/response/index.handler",
             runtime=lambda_.Runtime.PYTHON_3_12,
-            memory_size=128,
-            timeout=Duration.minutes(15),
+            memory_size=response_memory_size,
+            timeout=timeout,
             environment={
                 "HLS_FORWARD_BUCKET": hls_forward_bucket,
                 "HLS_HISTORICAL_BUCKET": hls_historical_bucket,
@@ -95,7 +106,7 @@ class HlsLpdaacReconciliationStack(Stack):
         )
 
         lpdaac_response_topic = sns.Topic.from_topic_arn(
-            self, "LpdaacResponseTopic", topic_arn=lpdaac_response_topic_arn
+            self, "LpdaacResponseTopic", lpdaac_response_topic_arn
         )
 
         # Subscribe response lambda function to response topic
@@ -109,12 +120,11 @@ class HlsLpdaacReconciliationStack(Stack):
         )
 
         # Allow lambda function to access buckets
-        s3.Bucket.from_bucket_name(
-            self, "HlsForwardBucket", hls_forward_bucket
-        ).grant_read_write(lpdaac_response_lambda)
-        s3.Bucket.from_bucket_name(
-            self, "HlsHistoricalBucket", hls_historical_bucket
-        ).grant_read_write(lpdaac_response_lambda)
-        s3.Bucket.from_bucket_name(
-            self, "LpdaacReconciliationReports", lpdaac_reconciliation_reports_bucket
-        ).grant_read(lpdaac_response_lambda)
+        for construct_id, bucket_name, read_only in (
+            ("HlsForwardBucket", hls_forward_bucket, False),
+            ("HlsHistoricalBucket", hls_historical_bucket, False),
+            ("LpdaacReconciliationReports", lpdaac_reconciliation_reports_bucket, True),
+        ):
+            bucket = s3.Bucket.from_bucket_name(self, construct_id, bucket_name)
+            grant = bucket.grant_read if read_only else bucket.grant_read_write
+            grant(lpdaac_response_lambda)
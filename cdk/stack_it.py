@@ -1,5 +1,3 @@
-from typing import Optional
-
 from aws_cdk import CfnOutput, RemovalPolicy, Stack
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_s3 as s3
@@ -15,19 +13,22 @@ class HlsLpdaacReconciliationStackIT(Stack):
         scope: Construct,
         construct_id: str,
         *,
-        managed_policy_name: Optional[str] = None,
+        managed_policy_name: str | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
         if managed_policy_name:
-            account_id = iam.AccountRootPrincipal().account_id
-
             iam.PermissionsBoundary.of(self).apply(
                 iam.ManagedPolicy.from_managed_policy_arn(
                     self,
                     "PermissionsBoundary",
-                    f"arn:aws:iam::{account_id}:policy/{managed_policy_name}",
+                    self.format_arn(
+                        service="iam",
+                        region="",
+                        resource="policy",
+                        resource_name=managed_policy_name,
+                    ),
                 )
             )
 
@@ -12,18 +12,52 @@ if TYPE_CHECKING:  # pragma: no cover
 
 sns_client = boto3.client("sns")
 
+# Maximum number of entries SNS accepts in a single PublishBatch request.
+PUBLISH_BATCH_SIZE = 10
 
-def handler(event: S3Event, _context: Any, *, topic_arn: Optional[str] = None) -> dict:
-    """Publish message to SNS topic with URL of HLS inventory report from S3 event."""
 
-    s3: S3 = event["Records"][0]["s3"]  # type: ignore
-    bucket = s3["bucket"]["name"]
-    key = s3["object"]["key"]  # type: ignore
-    message = {"report": {"uri": f"s3://{bucket}/{key}"}}
+def handler(
+    event: S3Event, _context: Any, *, topic_arn: Optional[str] = None
+) -> list[dict]:
+    """Publish messages to SNS topic with URLs of HLS inventory reports from S3 event.
+
+    Publishes one message per record in the event, in batches of up to
+    `PUBLISH_BATCH_SIZE` messages per request, and returns the published messages.
+
+    Raises
+    ------
+    RuntimeError
+        if SNS fails to publish any message in a batch, so that the invocation fails
+        and S3 retries it
+    """
+
+    messages = [report_message(record["s3"]) for record in event["Records"]]  # type: ignore
     topic_arn = topic_arn or os.environ["LPDAAC_REQUEST_TOPIC_ARN"]
 
-    print(f"Publishing HLS inventory report to SNS topic '{topic_arn}': {message}")
+    print(f"Publishing HLS inventory reports to SNS topic '{topic_arn}': {messages}")
+
+    for start in range(0, len(messages), PUBLISH_BATCH_SIZE):
+        response = sns_client.publish_batch(
+            TopicArn=topic_arn,
+            PublishBatchRequestEntries=[
+                {"Id": str(i), "Message": json.dumps(message)}
+                for i, message in enumerate(
+                    messages[start : start + PUBLISH_BATCH_SIZE], start
+                )
+            ],
+        )
 
-    sns_client.publish(TopicArn=topic_arn, Message=json.dumps(message))
+        # Unlike publish, publish_batch does not raise when individual entries fail.
+        if failed := response.get("Failed"):
+            errors = ", ".join(f"{f['Id']} ({f['Code']})" for f in failed)
+            raise RuntimeError(f"Failed to publish messages to SNS topic: {errors}")
+
+    return messages
+
+
+def report_message(s3: S3) -> dict:
+    """Return the SNS message announcing the inventory report in an S3 record."""
+    bucket = s3["bucket"]["name"]
+    key = s3["object"]["key"]  # type: ignore
 
-    return message
+    return {"report": {"uri": f"s3://{bucket}/{key}"}}
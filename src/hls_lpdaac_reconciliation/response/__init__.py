@@ -1,6 +1,11 @@
 import re
+from operator import itemgetter
 from typing import Literal, Mapping, Sequence
 
+REPORT_LOCATION_PATTERN = re.compile(
+    r"Report\s+available\s+at\s+(?P<bucket>[^/\s]+)/(?P<key>\S+)[.](?!\S)"
+)
+
 
 def decode_collection_id(collection_id: str) -> tuple[str, str]:
     """Decode a collection ID into a tuple of its name and version."""
@@ -27,13 +32,8 @@ def extract_report_location(message: str) -> tuple[str, str]:
         if the message does not contain text indicating a report location
     """
 
-    if match := re.search(
-        r"Report\s+available\s+at\s+(?P<loc>.+)[.]", message, re.MULTILINE
-    ):
-        location = match["loc"]
-        bucket, key = location.split("/", 1)
-
-        return bucket, key
+    if match := REPORT_LOCATION_PATTERN.search(message):
+        return match["bucket"], match["key"]
 
     raise ValueError(f"Cannot determine report location from message: '{message}'")
 
@@ -93,10 +93,9 @@ def group_granule_ids(
     return {
         decode_collection_id(collection_id): tuple(
             sorted(
-                {
-                    file_info["granuleId"]
-                    for file_info in collection_info["report"].values()
-                }
+                dict.fromkeys(
+                    map(itemgetter("granuleId"), collection_info["report"].values())
+                )
             )
         )
         for collection_report in report
@@ -107,8 +106,8 @@ def group_granule_ids(
 def notification_trigger_key(granule_id: str) -> str:
     """Returns the key for the S3 notification trigger object for a granule."""
     # Example: HLS.S30.T15XWH.2024237T194859.v2.0
-    # 'HLS', 'S30', 'T15XWH', '2024237T194859', ['v2', '0']
-    _hls, instrument, _tile_id, datetime, *_version = granule_id.split(".")
-    date, _time = datetime.split("T")
+    # 'HLS', 'S30', 'T15XWH', '2024237T194859', 'v2.0'
+    _hls, instrument, _tile_id, datetime, _version = granule_id.split(".", 4)
+    date, _, _time = datetime.partition("T")
 
     return f"{instrument}/data/{date}/{granule_id}/{granule_id}.json"
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import urllib.parse
-import urllib.request
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum, auto
-from functools import reduce
 from typing import Any, Mapping, Optional, Sequence, TYPE_CHECKING
 
 import boto3
+import urllib3
+from botocore.config import Config
 
 if TYPE_CHECKING:  # pragma: no cover
     from aws_lambda_typing.events import SNSEvent
@@ -26,8 +29,48 @@ class Status(StrEnum):
     MISSING = auto()
 
 
-s3_client = boto3.client("s3")
-s3_resource = boto3.resource("s3")
+# Subject of a message indicating that a report has no discrepancies
+OK_SUBJECT_PATTERN = re.compile(r"\bOk\s*$")
+
+# Maximum number of granules processed concurrently within a collection
+MAX_WORKERS = 32
+
+CMR_GRANULES_URL = "https://cmr.earthdata.nasa.gov/search/granules.json"
+# Maximum number of granules the CMR returns per page of search results
+CMR_PAGE_SIZE = 2000
+# Seconds to wait for the CMR to accept a connection or send data
+CMR_TIMEOUT = 10
+# Maximum number of granule IDs remembered as found in the CMR across invocations
+CMR_CACHE_SIZE = 50_000
+
+# Reuse connections to the CMR across searches and warm invocations, retrying
+# searches (which are safe to repeat) on throttling and server errors.
+cmr_http = urllib3.PoolManager(
+    timeout=urllib3.Timeout(connect=CMR_TIMEOUT, read=CMR_TIMEOUT),
+    retries=urllib3.Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+)
+
+# (short name, version, granule ID) of granules known to be in the CMR, least recently
+# used first, so the cache can be bounded to CMR_CACHE_SIZE entries.
+cmr_granule_ids: OrderedDict[tuple[str, str, str], None] = OrderedDict()
+
+# Fail fast on a stalled S3 request and retry it, rather than waiting out the default
+# 60-second timeouts.
+s3_client = boto3.client(
+    "s3",
+    config=Config(
+        connect_timeout=2,
+        read_timeout=5,
+        max_pool_connections=MAX_WORKERS,
+        retries={"max_attempts": 5, "mode": "adaptive"},
+        tcp_keepalive=True,
+    ),
+)
 
 
 def handler(
@@ -39,7 +82,7 @@ def handler(
 ) -> Mapping[str, Mapping[Status, Sequence[str]]]:
     """Handle AWS SNS message from LPDAAC regarding Cumulus ingestion reconciliation.
 
-    Skip message if the subject of the message contains `"Ok"`.  In this case, there
+    Skip message if the subject of the message ends with `"Ok"`.  In this case, there
     are no discrepancies (i.e., LPDAAC successfully ingested all granules that we
     notified them about since the last report).
 
@@ -78,8 +121,8 @@ def handler(
     subject = sns_message["Subject"]
     print("Subject:", subject)
 
-    if subject and "Ok" in subject:
-        # When the subject contains (ends with) "Ok", the message itself
+    if subject and OK_SUBJECT_PATTERN.search(subject):
+        # When the subject ends with "Ok", the message itself
         # indicates that there are no discrepencies, so there's nothing to do.
         # Example: "[External] Rec-Report HLS lp-prod HLS_reconcile_2024240_2.0.rpt Ok"
         return {}
@@ -94,7 +137,7 @@ def handler(
     )
 
     summary = process_report(report, data_bucket_name)
-    print(f"Processing summary: {summary}")
+    print(json.dumps({"summary": summary}))
 
     return summary
 
@@ -128,8 +171,7 @@ def read_report(bucket_name: str, key: str) -> Sequence[Mapping[str, Any]]:
     """
 
     print(f"Reading report from s3://{bucket_name}/{key}")
-    obj = s3_resource.Object(bucket_name, key)
-    return json.loads(obj.get()["Body"].read().decode("utf-8"))
+    return json.load(s3_client.get_object(Bucket=bucket_name, Key=key)["Body"])
 
 
 def process_report(
@@ -202,26 +244,41 @@ def process_collection(
             ...
         }
     """
-    print(f"{len(granule_ids)} missing from {short_name}___{version}")
+    granule_ids_by_status: defaultdict[Status, list[str]] = defaultdict(list)
+    granule_ids_in_cmr = granules_in_cmr(
+        short_name=short_name, version=version, granule_ids=granule_ids
+    )
 
-    def group_by_status(
-        acc: Mapping[Status, Sequence[str]], granule_id: str
-    ) -> Mapping[Status, Sequence[str]]:
-        status = process_granule(
-            short_name=short_name,
-            version=version,
+    def process(granule_id: str) -> Status:
+        return process_granule(
             granule_id=granule_id,
+            in_cmr=granule_id in granule_ids_in_cmr,
             data_bucket_name=data_bucket_name,
         )
 
-        return {**acc, status: [*acc.get(status, []), granule_id]}
+    # Each granule not in the CMR requires an S3 request, so make them concurrently.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for granule_id, status in zip(granule_ids, executor.map(process, granule_ids)):
+            granule_ids_by_status[status].append(granule_id)
 
-    return reduce(group_by_status, granule_ids, {})
+    # Log one structured line per collection rather than one line per granule.  The
+    # granule IDs for each status appear in the processing summary logged by handler.
+    print(
+        json.dumps(
+            {
+                "collection": f"{short_name}___{version}",
+                "granules": len(granule_ids),
+                "counts": {
+                    status: len(ids) for status, ids in granule_ids_by_status.items()
+                },
+            }
+        )
+    )
+
+    return dict(granule_ids_by_status)
 
 
-def process_granule(
-    *, short_name: str, version: str, granule_id: str, data_bucket_name: str
-) -> Status:
+def process_granule(*, granule_id: str, in_cmr: bool, data_bucket_name: str) -> Status:
     """Touch S3 notification trigger file for a granule if it is not in CMR.
 
     Triggers LPDAAC reingestion of the granule by touching the notification
@@ -230,12 +287,10 @@ def process_granule(
 
     Parameters
     ----------
-    short_name:
-        collection short name as it exists in the CMR
-    version:
-        collection version as it exists in the CMR
     granule_id:
         granule UR or producer granule id of a granule
+    in_cmr:
+        whether or not metadata for the granule exists in the CMR
     data_bucket_name:
         name of the bucket that contains the notification trigger file
 
@@ -246,30 +301,47 @@ def process_granule(
         in the CMR and it's associated "trigger" file was found in the specified data
         bucket (and touched, to trigger re-ingestion), otherwise `Status.MISSING`
         (indicating HLS reprocessing is required)
+
+    Raises
+    ------
+    botocore.exceptions.ClientError
+        if touching the trigger file fails for any reason other than the file not
+        existing (such as access being denied).  This fails the entire invocation,
+        even though other granules may have already been triggered, so a retried
+        invocation may trigger those granules again (resulting in duplicate
+        notifications to LPDAAC), but this is preferable to reporting a granule as
+        missing when its status is actually unknown.
     """
-    if granule_in_cmr(short_name=short_name, version=version, granule_id=granule_id):
-        print(f"{granule_id} is already available in CMR. Skipping.")
+    if in_cmr:
         return Status.SKIPPED
 
-    if s3_object_exists(data_bucket_name, key := notification_trigger_key(granule_id)):
+    key = notification_trigger_key(granule_id)
+
+    # Copy the trigger file onto itself without first checking that it exists, since
+    # it usually does, and treat a missing source as a missing trigger file.
+    try:
         s3_client.copy_object(
             Bucket=data_bucket_name,
             Key=key,
-            CopySource=f"{data_bucket_name}/{key}",
+            CopySource={"Bucket": data_bucket_name, "Key": key},
             MetadataDirective="REPLACE",
         )
         return Status.TRIGGERED
-
-    print(
-        f"{granule_id} needs to be resubmitted to the step function execution:"
-        f"notification trigger file not found: s3://{data_bucket_name}/{key}"
-    )
+    except s3_client.exceptions.ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey"):
+            raise
 
     return Status.MISSING
 
 
-def granule_in_cmr(*, short_name: str, version: str, granule_id: str) -> bool:
-    """Indicate whether or not metadata for a granule in a collection exists in the CMR.
+def granules_in_cmr(
+    *, short_name: str, version: str, granule_ids: Sequence[str]
+) -> set[str]:
+    """Determine which granules in a collection have metadata in the CMR.
+
+    Searches the CMR for the granules in batches of up to `CMR_PAGE_SIZE` granule
+    IDs per request, rather than issuing one request per granule, and skips granules
+    already found in the CMR by a previous search.
 
     Parameters
     ----------
@@ -277,31 +349,68 @@ def granule_in_cmr(*, short_name: str, version: str, granule_id: str) -> bool:
         name of collection that should contain the granule metadata
     version:
         version of collection that should contain the granule metadata
-    granule_id:
-        granule ur or producer granule id of a granule
+    granule_ids:
+        granule URs or producer granule ids of granules
 
     Returns
     -------
-    `True` if there is metadata in the CMR for the granule; `False` otherwise.
+    Set of the granule IDs found in the CMR (by granule UR or producer granule id),
+    which is a subset of `granule_ids`.
     """
 
-    params = urllib.parse.urlencode(
-        {
-            "short_name": short_name,
-            "version": version,
-            "readable_granule_name": granule_id,
-        }
-    )
-    url = f"https://cmr.earthdata.nasa.gov/search/granules?{params}"
+    # Granules are not removed from the CMR once ingested, so granules found in the CMR
+    # are remembered across warm invocations and not searched for again.  Granules not
+    # found are never cached, since they may be ingested at any time.
+    found: set[str] = set()
+    unknown: list[str] = []
+
+    for granule_id in dict.fromkeys(granule_ids):
+        if (key := (short_name, version, granule_id)) in cmr_granule_ids:
+            cmr_granule_ids.move_to_end(key)
+            found.add(granule_id)
+        else:
+            unknown.append(granule_id)
+
+    for start in range(0, len(unknown), CMR_PAGE_SIZE):
+        data = urllib.parse.urlencode(
+            {
+                "short_name": short_name,
+                "version": version,
+                "page_size": CMR_PAGE_SIZE,
+                "readable_granule_name[]": unknown[start : start + CMR_PAGE_SIZE],
+            },
+            doseq=True,
+        )
+
+        response = cmr_http.request(
+            "POST",
+            CMR_GRANULES_URL,
+            body=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
 
-    with urllib.request.urlopen(url) as response:
-        return response.headers.get("cmr-hits", "0") != "0"
+        if response.status != 200:
+            raise urllib3.exceptions.HTTPError(
+                f"CMR search failed with status {response.status}: {response.data!r}"
+            )
 
+        # readable_granule_name matches either the granule UR (title) or the producer
+        # granule ID, so a granule is found if either one matches a requested ID.
+        names: set[str] = set()
 
-def s3_object_exists(bucket: str, key: str) -> bool:
-    """Return `True` if an S3 object exists; `False` otherwise."""
-    try:
-        s3_client.head_object(Bucket=bucket, Key=key)
-        return True
-    except s3_client.exceptions.ClientError:
-        return False
+        for entry in json.loads(response.data)["feed"]["entry"]:
+            names.add(entry["title"])
+
+            if producer_granule_id := entry.get("producer_granule_id"):
+                names.add(producer_granule_id)
+
+        for granule_id in unknown[start : start + CMR_PAGE_SIZE]:
+            if granule_id in names:
+                found.add(granule_id)
+                cmr_granule_ids[(short_name, version, granule_id)] = None
+
+    # Evict the least recently used granule IDs beyond the size limit.
+    while len(cmr_granule_ids) > CMR_CACHE_SIZE:
+        cmr_granule_ids.popitem(last=False)
+
+    return found
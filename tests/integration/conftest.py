@@ -4,12 +4,16 @@ from pathlib import Path
 
 import boto3
 import pytest
+from botocore.config import Config
 
 from mypy_boto3_lambda import LambdaClient
 from mypy_boto3_s3 import S3Client
 from mypy_boto3_sns import SNSClient
 from mypy_boto3_sqs import SQSClient
 
+# Back off and retry when throttled rather than failing the test outright
+retrying_config = Config(retries={"max_attempts": 3, "mode": "adaptive"})
+
 
 @pytest.fixture(scope="session")
 def lambda_() -> LambdaClient:
@@ -18,7 +22,7 @@ def lambda_() -> LambdaClient:
 
 @pytest.fixture(scope="session")
 def s3() -> S3Client:
-    return boto3.client("s3")
+    return boto3.client("s3", config=retrying_config)
 
 
 @pytest.fixture(scope="session")
@@ -28,20 +32,28 @@ def sns() -> SNSClient:
 
 @pytest.fixture(scope="session")
 def sqs() -> SQSClient:
-    return boto3.client("sqs")
+    return boto3.client("sqs", config=retrying_config)
 
 
 @pytest.fixture(scope="session")
 def cdk_outputs() -> dict[str, str]:
-    outputs_by_stack: dict[str, dict[str, str]] = json.loads(
-        (Path() / "cdk.out" / "outputs.json").read_text()
-    )
+    path = Path() / "cdk.out" / "outputs.json"
+
+    if not path.exists():
+        raise FileNotFoundError(
+            f"CDK outputs file {path} not found (run `make deploy-it` first)"
+        )
+
+    outputs_by_stack: dict[str, dict[str, str]] = json.loads(path.read_text())
 
-    return next(
-        (
+    try:
+        return next(
             outputs
             for stack, outputs in outputs_by_stack.items()
             if stack.casefold().endswith("resources")
-        ),
-        {},
-    )
+        )
+    except StopIteration:
+        raise LookupError(
+            f"No outputs for an integration test resources stack in {path}"
+            f" (found stacks: {', '.join(outputs_by_stack) or 'none'})"
+        ) from None
@@ -1,11 +1,15 @@
+import copy
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Iterator
 
 import boto3
 import pytest
 from aws_lambda_typing.events import S3Event, SNSEvent
+from aws_lambda_typing.events.sns import SNSEventRecord, SNSMessage
 from moto import mock_aws
+from moto.core.models import MockAWS
 from mypy_boto3_s3 import S3ServiceResource
 from mypy_boto3_s3.service_resource import Bucket, Object
 from mypy_boto3_sns import SNSServiceResource
@@ -13,8 +17,25 @@ from mypy_boto3_sns.service_resource import Topic
 from mypy_boto3_sqs import SQSServiceResource
 from mypy_boto3_sqs.service_resource import Queue
 
+FIXTURES_DIR = Path("tests") / "fixtures"
 
-@pytest.fixture
+# Fixture files never change during a test session, so read each of them only once.
+REPORT_BYTES = (FIXTURES_DIR / "HLS_reconcile_2024239_2.0.json").read_bytes()
+DISCREPANCIES_MESSAGE = (FIXTURES_DIR / "message-discrepancies.txt").read_text()
+DISCREPANCIES_HISTORICAL_MESSAGE = (
+    FIXTURES_DIR / "message-discrepancies-historical.txt"
+).read_text()
+
+
+@pytest.fixture(scope="module")
+def vcr_config() -> dict[str, str]:
+    # Replay recorded cassettes only, so a test making an unrecorded request fails
+    # immediately instead of silently reaching the network.  To re-record cassettes,
+    # run pytest with --vcr-record=all (or new_episodes).
+    return {"record_mode": "none"}
+
+
+@pytest.fixture(scope="session")
 def aws_credentials():
     """Mocked AWS Credentials for moto."""
     os.environ["AWS_ACCESS_KEY_ID"] = "testing"
@@ -24,10 +45,22 @@ def aws_credentials():
     os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 
 
-@pytest.fixture
-def s3_resource(aws_credentials) -> Iterator[S3ServiceResource]:
-    with mock_aws():
-        yield boto3.resource("s3")
+@pytest.fixture(scope="session")
+def aws_mock(aws_credentials) -> Iterator[MockAWS]:
+    """Mock AWS once for the entire test session."""
+    with mock_aws() as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def reset_aws_mock(aws_mock: MockAWS) -> None:
+    """Discard mocked AWS resources created by the previous test."""
+    aws_mock.reset()
+
+
+@pytest.fixture(scope="session")
+def s3_resource(aws_mock: MockAWS) -> S3ServiceResource:
+    return boto3.resource("s3")
 
 
 @pytest.fixture
@@ -38,10 +71,9 @@ def s3_bucket(s3_resource: S3ServiceResource) -> Bucket:
     return bucket
 
 
-@pytest.fixture
-def sns_resource(aws_credentials) -> Iterator[SNSServiceResource]:
-    with mock_aws():
-        yield boto3.resource("sns")
+@pytest.fixture(scope="session")
+def sns_resource(aws_mock: MockAWS) -> SNSServiceResource:
+    return boto3.resource("sns")
 
 
 @pytest.fixture
@@ -49,10 +81,9 @@ def sns_topic(sns_resource: SNSServiceResource) -> Topic:
     return sns_resource.create_topic(Name="request-reconciliation")
 
 
-@pytest.fixture
-def sqs_resource(aws_credentials) -> Iterator[SQSServiceResource]:
-    with mock_aws():
-        yield boto3.resource("sqs")
+@pytest.fixture(scope="session")
+def sqs_resource(aws_mock: MockAWS) -> SQSServiceResource:
+    return boto3.resource("sqs")
 
 
 @pytest.fixture
@@ -60,11 +91,19 @@ def sqs_queue(sqs_resource: SQSServiceResource) -> Queue:
     return sqs_resource.create_queue(QueueName="mock-lpdaac")
 
 
+@pytest.fixture
+def empty_cmr_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Start each test without any CMR search results cached by a previous test.
+    monkeypatch.setattr(
+        "hls_lpdaac_reconciliation.response.index.cmr_granule_ids", OrderedDict()
+    )
+
+
 @pytest.fixture
 def s3_trigger_object(s3_bucket: Bucket) -> Object:
-    # NOTE: This aligns with the entry for HLS.S30.T15XWH.2124237T194859.v2.0 in
-    # tests/unit/cassettes/test_lpdaac_forward_handler.yaml, where we have manually
-    # set the CMR-Hits header to 0 to force a "not in CMR" result, which should then
+    # NOTE: This aligns with HLS.S30.T15XWH.2124237T194859.v2.0 in the CMR search
+    # of tests/unit/cassettes/test_lpdaac_forward_handler.yaml, where we have manually
+    # omitted it from the results to force a "not in CMR" result, which should then
     # attempt to "touch" this "trigger" object.  We don't care what's inside the file,
     # only that it exists, so we simply make the contents an empty JSON object.
     return s3_bucket.put_object(
@@ -86,18 +125,15 @@ def s3_report_bucket(s3_resource: S3ServiceResource) -> Bucket:
 
 @pytest.fixture
 def s3_reconciliation_report(s3_report_bucket: Bucket) -> Object:
-    report = Path("tests") / "fixtures" / "HLS_reconcile_2024239_2.0.json"
     return s3_report_bucket.put_object(
-        Key="reports/HLS_reconcile_2024239_2.0.json", Body=report.read_bytes()
+        Key="reports/HLS_reconcile_2024239_2.0.json", Body=REPORT_BYTES
     )
 
 
 @pytest.fixture
 def s3_historical_reconciliation_report(s3_report_bucket: Bucket) -> Object:
-    report = Path("tests") / "fixtures" / "HLS_reconcile_2024239_2.0.json"
     return s3_report_bucket.put_object(
-        Key="reports/HLS_historical_reconcile_2024239_2.0.json",
-        Body=report.read_bytes(),
+        Key="reports/HLS_historical_reconcile_2024239_2.0.json", Body=REPORT_BYTES
     )
 
 
@@ -117,11 +153,9 @@ def sns_event_discrepancies(
     # on it ensures it exists in our test bucket before the SNS event is generated.
     # However, the S3 key of the report object must match the S3 key given within the
     # message-discrepancies.txt fixture.
-    message_fixture = Path("tests") / "fixtures" / "message-discrepancies.txt"
-
     return make_sns_event(
         subject="Rec-Report HLS lp-prod HLS_reconcile_2024239_2.0.rpt",
-        message=message_fixture.read_text().format(bucket=s3_report_bucket.name),
+        message=DISCREPANCIES_MESSAGE.format(bucket=s3_report_bucket.name),
     )
 
 
@@ -134,66 +168,69 @@ def sns_event_discrepancies_historical(
     # on it ensures it exists in our test bucket before the SNS event is generated.
     # However, the S3 key of the report object must match the S3 key given within the
     # message-discrepancies-historical.txt fixture.
-    message_fixture = (
-        Path("tests") / "fixtures" / "message-discrepancies-historical.txt"
-    )
-
     return make_sns_event(
         subject="Rec-Report HLS lp-prod HLS_historical_reconcile_2024239_2.0.rpt",
-        message=message_fixture.read_text().format(bucket=s3_report_bucket.name),
+        message=DISCREPANCIES_HISTORICAL_MESSAGE.format(bucket=s3_report_bucket.name),
     )
 
 
+S3_EVENT: S3Event = {
+    "Records": [
+        {
+            "s3": {
+                "s3SchemaVersion": "1.0",
+                "configurationId": "Send Reconciliation Report to LP",
+                "bucket": {
+                    "name": "impact-hls-inventories",
+                    "ownerIdentity": {"principalId": "A2QANSYYP2EUOB"},
+                    "arn": "arn:aws:s3:::impact-hls-inventories",
+                },
+                "object": {
+                    "key": "reconciliation_reports/2022100/HLS_reconcile_2022100_2.0.rpt",
+                    "size": 14749022,
+                    "eTag": "cf72d76e2a9ff0786bb4b2f199df0099",
+                    "sequencer": "0060F0B7E16A823983",
+                },
+            },
+        }
+    ]
+}
+
+
 @pytest.fixture
 def s3_event() -> S3Event:
-    return {
-        "Records": [
-            {
-                "s3": {
-                    "s3SchemaVersion": "1.0",
-                    "configurationId": "Send Reconciliation Report to LP",
-                    "bucket": {
-                        "name": "impact-hls-inventories",
-                        "ownerIdentity": {"principalId": "A2QANSYYP2EUOB"},
-                        "arn": "arn:aws:s3:::impact-hls-inventories",
-                    },
-                    "object": {
-                        "key": "reconciliation_reports/2022100/HLS_reconcile_2022100_2.0.rpt",
-                        "size": 14749022,
-                        "eTag": "cf72d76e2a9ff0786bb4b2f199df0099",
-                        "sequencer": "0060F0B7E16A823983",
-                    },
-                },
-            }
-        ]
-    }
+    # Copy the event so a test that modifies it cannot affect other tests.
+    return copy.deepcopy(S3_EVENT)
+
+
+# We only care about "Subject" and "Message" within Records[0]["Sns"], but dummy values
+# are populated everywhere else to make the event conform to the SNSEvent type definition.
+SNS_RECORD_TEMPLATE: SNSEventRecord = {
+    "EventVersion": "1.0",
+    "EventSubscriptionArn": "arn:aws:sns:us-east-1:123456789012:MyTopic",
+    "EventSource": "aws:sns",
+    "Sns": {
+        "Subject": "",
+        "Message": "",
+        "SignatureVersion": "1",
+        "Timestamp": "1970-01-01T00:00:00.000Z",
+        "Signature": "EXAMPLE",
+        "SigningCertUrl": "EXAMPLE",
+        "MessageId": "95df01b4-ee98-5cb9-9903-4c221d41eb5e",
+        "MessageAttributes": {"Test": {"Type": "String", "Value": "TestString"}},
+        "Type": "Notification",
+        "UnsubscribeUrl": "EXAMPLE",
+        "TopicArn": "arn:aws:sns:us-east-1:123456789012:MyTopic",
+    },
+}
 
 
 def make_sns_event(*, subject: str, message: str) -> SNSEvent:
-    # We only care about "Subject" and "Message" within Records[0]["Sns"], but dummy
-    # values are populated everywhere else to make the event conform to the SNSEvent
-    # type definition.
-    return {
-        "Records": [
-            {
-                "EventVersion": "1.0",
-                "EventSubscriptionArn": "arn:aws:sns:us-east-1:123456789012:MyTopic",
-                "EventSource": "aws:sns",
-                "Sns": {
-                    "Subject": subject,
-                    "Message": message,
-                    "SignatureVersion": "1",
-                    "Timestamp": "1970-01-01T00:00:00.000Z",
-                    "Signature": "EXAMPLE",
-                    "SigningCertUrl": "EXAMPLE",
-                    "MessageId": "95df01b4-ee98-5cb9-9903-4c221d41eb5e",
-                    "MessageAttributes": {
-                        "Test": {"Type": "String", "Value": "TestString"}
-                    },
-                    "Type": "Notification",
-                    "UnsubscribeUrl": "EXAMPLE",
-                    "TopicArn": "arn:aws:sns:us-east-1:123456789012:MyTopic",
-                },
-            },
-        ],
+    sns: SNSMessage = {
+        **SNS_RECORD_TEMPLATE["Sns"],
+        "Subject": subject,
+        "Message": message,
     }
+    record: SNSEventRecord = {**SNS_RECORD_TEMPLATE, "Sns": sns}
+
+    return {"Records": [record]}
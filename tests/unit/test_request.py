@@ -1,5 +1,7 @@
+import copy
 import json
 
+import pytest
 from aws_lambda_typing.events import S3Event
 from mypy_boto3_sns.service_resource import Topic
 from mypy_boto3_sqs.service_resource import Queue
@@ -18,9 +20,61 @@ def test_request(s3_event: S3Event, sns_topic: Topic, sqs_queue: Queue) -> None:
     # published a message to the topic by reading the message from the queue.
     sns_topic.subscribe(Protocol="sqs", Endpoint=sqs_queue.attributes["QueueArn"])
 
-    message = handler(s3_event, None, topic_arn=sns_topic.arn)
-    messages = sqs_queue.receive_messages(MaxNumberOfMessages=2, WaitTimeSeconds=20)
+    [message] = handler(s3_event, None, topic_arn=sns_topic.arn)
+    messages = sqs_queue.receive_messages(MaxNumberOfMessages=2, WaitTimeSeconds=0)
 
     assert message == {"report": {"uri": f"s3://{bucket}/{key}"}}
     assert len(messages) == 1
     assert json.loads(json.loads(messages[0].body)["Message"]) == message
+
+
+def test_request_multiple_records(
+    s3_event: S3Event, sns_topic: Topic, sqs_queue: Queue
+) -> None:
+    from hls_lpdaac_reconciliation.request.index import handler
+
+    # More records than fit in a single SNS PublishBatch request
+    [record] = s3_event["Records"]
+    records = [copy.deepcopy(record) for _ in range(12)]
+
+    for i, r in enumerate(records):
+        r["s3"]["object"]["key"] = f"reconciliation_reports/{i}.rpt"  # type: ignore
+
+    sns_topic.subscribe(Protocol="sqs", Endpoint=sqs_queue.attributes["QueueArn"])
+
+    messages = handler({"Records": records}, None, topic_arn=sns_topic.arn)
+    received = [
+        json.loads(json.loads(m.body)["Message"])
+        for _ in range(2)
+        for m in sqs_queue.receive_messages(MaxNumberOfMessages=10, WaitTimeSeconds=0)
+    ]
+
+    assert len(messages) == len(records)
+    assert sorted(received, key=str) == sorted(messages, key=str)
+
+
+def test_request_publish_failure(s3_event: S3Event, sns_topic: Topic) -> None:
+    from botocore.stub import Stubber
+
+    from hls_lpdaac_reconciliation.request.index import handler, sns_client
+
+    # publish_batch reports failed entries in its response rather than raising, so
+    # the handler must raise on its own to make the invocation fail (and be retried).
+    with Stubber(sns_client) as stubber:
+        stubber.add_response(
+            "publish_batch",
+            {
+                "Successful": [],
+                "Failed": [
+                    {
+                        "Id": "0",
+                        "Code": "InternalError",
+                        "Message": "Internal error",
+                        "SenderFault": False,
+                    }
+                ],
+            },
+        )
+
+        with pytest.raises(RuntimeError, match=r"0 \(InternalError\)"):
+            handler(s3_event, None, topic_arn=sns_topic.arn)
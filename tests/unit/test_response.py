@@ -1,8 +1,31 @@
 from __future__ import annotations
 
+import json
+import urllib.parse
+from typing import Any
+
 import pytest
+import urllib3
 from aws_lambda_typing.events import SNSEvent
 from mypy_boto3_s3.service_resource import Bucket, Object
+from vcr.cassette import Cassette
+
+
+class FakeCMR:
+    """Stand-in for the CMR connection pool that replays canned search responses."""
+
+    def __init__(self, *responses: urllib3.HTTPResponse) -> None:
+        self.responses = list(responses)
+        self.searches: list[dict[str, list[str]]] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> urllib3.HTTPResponse:
+        self.searches.append(urllib.parse.parse_qs(kwargs["body"]))
+        return self.responses.pop(0)
+
+
+def cmr_response(*entries: dict[str, str], status: int = 200) -> urllib3.HTTPResponse:
+    body = json.dumps({"feed": {"entry": list(entries)}}).encode()
+    return urllib3.HTTPResponse(body=body, status=status)
 
 
 @pytest.mark.vcr()
@@ -10,6 +33,7 @@ def test_lpdaac_forward_handler(
     sns_event_discrepancies: SNSEvent,
     s3_bucket: Bucket,
     s3_trigger_object: Object,
+    empty_cmr_cache: None,
 ) -> None:
     # Import here (rather than at top level) to ensure AWS mocks are established.
     # See http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
@@ -20,12 +44,12 @@ def test_lpdaac_forward_handler(
     assert results == {
         "HLSL30___2.0": {},
         "HLSS30___2.0": {
-            # CMR-Hits is 0 and "trigger" file exists in forward bucket (as
-            # written for the s3_forward_trigger_object test fixture)
+            # Not in CMR results and "trigger" file exists in forward bucket (as
+            # written for the s3_trigger_object test fixture)
             Status.TRIGGERED: ["HLS.S30.T15XWH.2124237T194859.v2.0"],
-            # CMR-Hits is 0 and "trigger" file does NOT exist in forward bucket
+            # Not in CMR results and "trigger" file does NOT exist in forward bucket
             Status.MISSING: ["HLS.S30.T36PWU.2124237T080609.v2.0"],
-            # CMR-Hits is 1
+            # In CMR results
             Status.SKIPPED: ["HLS.S30.T46TDQ.2024237T044659.v2.0"],
         },
     }
@@ -36,6 +60,7 @@ def test_lpdaac_historical_handler(
     sns_event_discrepancies_historical: SNSEvent,
     s3_bucket: Bucket,
     s3_trigger_object: Object,
+    empty_cmr_cache: None,
 ) -> None:
     # Import here (rather than at top level) to ensure AWS mocks are established.
     # See http://docs.getmoto.org/en/latest/docs/getting_started.html#what-about-those-pesky-imports
@@ -48,17 +73,88 @@ def test_lpdaac_historical_handler(
     assert results == {
         "HLSL30___2.0": {},
         "HLSS30___2.0": {
-            # CMR-Hits is 0 and "trigger" file exists in forward bucket (as
-            # written for the s3_forward_trigger_object test fixture)
+            # Not in CMR results and "trigger" file exists in forward bucket (as
+            # written for the s3_trigger_object test fixture)
             Status.TRIGGERED: ["HLS.S30.T15XWH.2124237T194859.v2.0"],
-            # CMR-Hits is 0 and "trigger" file does NOT exist in forward bucket
+            # Not in CMR results and "trigger" file does NOT exist in forward bucket
             Status.MISSING: ["HLS.S30.T36PWU.2124237T080609.v2.0"],
-            # CMR-Hits is 1
+            # In CMR results
             Status.SKIPPED: ["HLS.S30.T46TDQ.2024237T044659.v2.0"],
         },
     }
 
 
+# The forward handler's cassette holds a single search, matching the first invocation.
+# Replaying it for the second invocation's search lets us check what that search asks
+# for.  (pytest-vcr ignores cassette names given to the marker, so the cassette is
+# selected by parametrizing its vcr_cassette_name fixture instead.)
+@pytest.mark.vcr(allow_playback_repeats=True)
+@pytest.mark.parametrize("vcr_cassette_name", ["test_lpdaac_forward_handler"])
+def test_cmr_cache_across_invocations(
+    sns_event_discrepancies: SNSEvent,
+    s3_bucket: Bucket,
+    s3_trigger_object: Object,
+    empty_cmr_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+    vcr_cassette: Cassette,
+) -> None:
+    from hls_lpdaac_reconciliation.response import index
+
+    searches: list[list[str]] = []
+    request = index.cmr_http.request
+
+    def spy(method: str, url: str, **kwargs: Any) -> Any:
+        searches.append(urllib.parse.parse_qs(kwargs["body"])["readable_granule_name[]"])
+        return request(method, url, **kwargs)
+
+    monkeypatch.setattr(index.cmr_http, "request", spy)
+
+    first = index.handler(
+        sns_event_discrepancies, None, hls_forward_bucket=s3_bucket.name
+    )
+    second = index.handler(
+        sns_event_discrepancies, None, hls_forward_bucket=s3_bucket.name
+    )
+
+    assert first == second
+    assert vcr_cassette.play_count == 2
+    assert searches == [
+        [
+            "HLS.S30.T15XWH.2124237T194859.v2.0",
+            "HLS.S30.T36PWU.2124237T080609.v2.0",
+            "HLS.S30.T46TDQ.2024237T044659.v2.0",
+        ],
+        # Granules found by the first search are cached and not searched for again,
+        # but granules not found are searched for again, since they may have been
+        # ingested in the meantime.
+        [
+            "HLS.S30.T15XWH.2124237T194859.v2.0",
+            "HLS.S30.T36PWU.2124237T080609.v2.0",
+        ],
+    ]
+
+
+def test_process_granule_copy_error(s3_bucket: Bucket) -> None:
+    from botocore.exceptions import ClientError
+    from botocore.stub import Stubber
+
+    from hls_lpdaac_reconciliation.response.index import process_granule, s3_client
+
+    # Only a missing trigger file means the granule is missing, so any other error
+    # must propagate rather than be reported as Status.MISSING.
+    with Stubber(s3_client) as stubber:
+        stubber.add_client_error(
+            "copy_object", service_error_code="AccessDenied", http_status_code=403
+        )
+
+        with pytest.raises(ClientError, match="AccessDenied"):
+            process_granule(
+                granule_id="HLS.S30.T15XWH.2124237T194859.v2.0",
+                in_cmr=False,
+                data_bucket_name=s3_bucket.name,
+            )
+
+
 def test_no_discrepancies(
     sns_event_no_discrepancies: SNSEvent,
     s3_bucket: Bucket,
@@ -66,7 +162,104 @@ def test_no_discrepancies(
     from hls_lpdaac_reconciliation.response.index import handler
 
     # handler should return immediately with an empty object since the message's
-    # subject contains "Ok"
+    # subject ends with "Ok"
     assert {} == handler(
         sns_event_no_discrepancies, None, hls_forward_bucket=s3_bucket.name
     )
+
+
+def test_ok_not_trailing_subject(
+    sns_event_discrepancies: SNSEvent,
+    s3_bucket: Bucket,
+    s3_trigger_object: Object,
+    empty_cmr_cache: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from hls_lpdaac_reconciliation.response import index
+    from hls_lpdaac_reconciliation.response.index import Status
+
+    # "Ok" appears in the subject, but not as its trailing word, so the report must
+    # still be processed.
+    sns_event_discrepancies["Records"][0]["Sns"][
+        "Subject"
+    ] = "Rec-Report HLS lp-prod Ok_2024239.rpt"
+    cmr = FakeCMR(cmr_response({"title": "HLS.S30.T46TDQ.2024237T044659.v2.0"}))
+    monkeypatch.setattr(index, "cmr_http", cmr)
+
+    results = index.handler(
+        sns_event_discrepancies, None, hls_forward_bucket=s3_bucket.name
+    )
+
+    assert results == {
+        "HLSL30___2.0": {},
+        "HLSS30___2.0": {
+            Status.TRIGGERED: ["HLS.S30.T15XWH.2124237T194859.v2.0"],
+            Status.MISSING: ["HLS.S30.T36PWU.2124237T080609.v2.0"],
+            Status.SKIPPED: ["HLS.S30.T46TDQ.2024237T044659.v2.0"],
+        },
+    }
+
+
+def test_granules_in_cmr_multiple_searches(
+    empty_cmr_cache: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from hls_lpdaac_reconciliation.response import index
+
+    cmr = FakeCMR(
+        # Found by granule UR
+        cmr_response({"title": "G1"}),
+        # Found by producer granule ID, which differs from the granule UR
+        cmr_response({"title": "G3-UR", "producer_granule_id": "G3"}),
+    )
+    monkeypatch.setattr(index, "cmr_http", cmr)
+    monkeypatch.setattr(index, "CMR_PAGE_SIZE", 2)
+
+    found = index.granules_in_cmr(
+        short_name="HLSS30", version="2.0", granule_ids=["G1", "G2", "G3"]
+    )
+
+    assert found == {"G1", "G3"}
+    assert [search["readable_granule_name[]"] for search in cmr.searches] == [
+        ["G1", "G2"],
+        ["G3"],
+    ]
+
+
+def test_granules_in_cmr_cache_size(
+    empty_cmr_cache: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from hls_lpdaac_reconciliation.response import index
+
+    cmr = FakeCMR(
+        cmr_response({"title": "G1"}, {"title": "G2"}, {"title": "G3"}),
+        cmr_response({"title": "G1"}),
+    )
+    monkeypatch.setattr(index, "cmr_http", cmr)
+    monkeypatch.setattr(index, "CMR_CACHE_SIZE", 2)
+    granule_ids = ["G1", "G2", "G3"]
+
+    first = index.granules_in_cmr(
+        short_name="HLSS30", version="2.0", granule_ids=granule_ids
+    )
+    second = index.granules_in_cmr(
+        short_name="HLSS30", version="2.0", granule_ids=granule_ids
+    )
+
+    # Only the 2 most recently cached granule IDs are kept, so the least recently used
+    # one must be searched for again.
+    assert first == second == set(granule_ids)
+    assert [search["readable_granule_name[]"] for search in cmr.searches] == [
+        granule_ids,
+        ["G1"],
+    ]
+
+
+def test_granules_in_cmr_search_failure(
+    empty_cmr_cache: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from hls_lpdaac_reconciliation.response import index
+
+    monkeypatch.setattr(index, "cmr_http", FakeCMR(cmr_response(status=400)))
+
+    with pytest.raises(urllib3.exceptions.HTTPError, match="status 400"):
+        index.granules_in_cmr(short_name="HLSS30", version="2.0", granule_ids=["G1"])